@@ -35,10 +35,16 @@ MAX_ARTICLES_PER_SOURCE = 20  # 每个源最多采集文章数
 # 筛选配置
 RELEVANCE_THRESHOLD = 0.5  # 相关性阈值
 DEDUP_SIMILARITY_THRESHOLD = 0.8  # 去重相似度阈值
+OVERVIEW_TITLE_SIMILARITY_THRESHOLD = 0.6  # 周报综述标题去重阈值（字符二元组Jaccard）
 MIN_IMPORTANCE_FOR_REPORT = 3  # 最低报送评分
 
 # LLM 批量处理
 LLM_BATCH_SIZE = 15  # 每批发送给LLM的文章数
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))  # 并发LLM请求上限
+
+# LLM 结果缓存（重跑同一批输入时直接复用）
+LLM_CACHE_DIR = Path(os.getenv("LLM_CACHE_DIR", str(PROJECT_ROOT / "cache")))
+LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", str(24 * 3600)))  # 秒
 
 # 报告配置
 REPORT_TITLE = "人工智能动态简报"
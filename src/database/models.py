@@ -4,6 +4,9 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional
 
+# 重要性星级字符串（评分范围很小，预先生成）
+_STARS = tuple("★" * i for i in range(11))
+
 
 @dataclass
 class RawArticle:
@@ -47,7 +50,8 @@ class CuratedArticle:
     @property
     def importance_stars(self) -> str:
         """返回星级标记"""
-        return "★" * self.importance_score
+        score = self.importance_score
+        return _STARS[score] if 0 <= score < len(_STARS) else "★" * score
 
 
 @dataclass
@@ -2,6 +2,7 @@
 
 import sqlite3
 import logging
+import sys
 from pathlib import Path
 from typing import Optional
 from datetime import datetime, timedelta
@@ -13,6 +14,9 @@ from src.config.settings import DB_PATH
 
 logger = logging.getLogger(__name__)
 
+# 索引页所需的 (日报, 周报, 月报) 列表
+IndexReports = tuple[list[DailyReport], list[WeeklyReport], list[MonthlyReport]]
+
 
 class DatabaseStore:
     """SQLite数据库操作封装"""
@@ -243,14 +247,14 @@ class DatabaseStore:
     def get_curated_articles_by_date_range(
         self, start_date: str, end_date: str
     ) -> list[CuratedArticle]:
-        """获取日期范围内的筛选文章"""
+        """获取日期范围内的筛选文章（按重要性降序，周报/月报依赖此顺序）"""
         conn = self._get_conn()
         try:
             rows = conn.execute(
                 """SELECT * FROM curated_articles
                    WHERE report_date >= ? AND report_date <= ?
                      AND is_selected_for_report = 1
-                   ORDER BY importance_score DESC, category""",
+                   ORDER BY importance_score DESC, category, report_date DESC""",
                 (start_date, end_date)
             ).fetchall()
             return [self._row_to_curated_article(r) for r in rows]
@@ -262,19 +266,27 @@ class DatabaseStore:
     def insert_daily_report(self, report: DailyReport) -> int:
         conn = self._get_conn()
         try:
-            cursor = conn.execute(
-                """INSERT OR REPLACE INTO daily_reports
-                   (report_date, html_path, article_count, source_count,
-                    total_collected, generated_at)
-                   VALUES (?, ?, ?, ?, ?, ?)""",
-                (report.report_date, report.html_path, report.article_count,
-                 report.source_count, report.total_collected, report.generated_at)
-            )
+            cursor = self._execute_insert_daily_report(conn, report)
             conn.commit()
             return cursor.lastrowid or 0
         finally:
             conn.close()
 
+    def finalize_daily_and_get_index(self, report: DailyReport) -> IndexReports:
+        """写入日报记录并在同一事务内读取索引页所需的全部报告
+
+        Returns:
+            (日报列表, 周报列表, 月报列表)，已包含刚写入的日报
+        """
+        conn = self._get_conn()
+        try:
+            self._execute_insert_daily_report(conn, report)
+            reports = self._fetch_index_reports(conn)
+            conn.commit()
+            return reports
+        finally:
+            conn.close()
+
     def insert_weekly_report(self, report: WeeklyReport) -> int:
         conn = self._get_conn()
         try:
@@ -314,12 +326,7 @@ class DatabaseStore:
             rows = conn.execute(
                 "SELECT * FROM daily_reports ORDER BY report_date DESC"
             ).fetchall()
-            return [DailyReport(
-                report_date=r["report_date"], html_path=r["html_path"],
-                article_count=r["article_count"], source_count=r["source_count"],
-                total_collected=r["total_collected"], generated_at=r["generated_at"],
-                id=r["id"]
-            ) for r in rows]
+            return [self._row_to_daily_report(r) for r in rows]
         finally:
             conn.close()
 
@@ -329,12 +336,7 @@ class DatabaseStore:
             rows = conn.execute(
                 "SELECT * FROM weekly_reports ORDER BY year DESC, week_number DESC"
             ).fetchall()
-            return [WeeklyReport(
-                week_start=r["week_start"], week_end=r["week_end"],
-                year=r["year"], week_number=r["week_number"],
-                html_path=r["html_path"], article_count=r["article_count"],
-                generated_at=r["generated_at"], id=r["id"]
-            ) for r in rows]
+            return [self._row_to_weekly_report(r) for r in rows]
         finally:
             conn.close()
 
@@ -344,11 +346,15 @@ class DatabaseStore:
             rows = conn.execute(
                 "SELECT * FROM monthly_reports ORDER BY year DESC, month DESC"
             ).fetchall()
-            return [MonthlyReport(
-                year=r["year"], month=r["month"],
-                html_path=r["html_path"], article_count=r["article_count"],
-                generated_at=r["generated_at"], id=r["id"]
-            ) for r in rows]
+            return [self._row_to_monthly_report(r) for r in rows]
+        finally:
+            conn.close()
+
+    def get_all_reports_for_index(self) -> IndexReports:
+        """一次连接读取日报/周报/月报全部记录（用于索引页）"""
+        conn = self._get_conn()
+        try:
+            return self._fetch_index_reports(conn)
         finally:
             conn.close()
 
@@ -465,17 +471,79 @@ class DatabaseStore:
             content_hash=row["content_hash"],
         )
 
+    @staticmethod
+    def _execute_insert_daily_report(
+        conn: sqlite3.Connection, report: DailyReport
+    ) -> sqlite3.Cursor:
+        return conn.execute(
+            """INSERT OR REPLACE INTO daily_reports
+               (report_date, html_path, article_count, source_count,
+                total_collected, generated_at)
+               VALUES (?, ?, ?, ?, ?, ?)""",
+            (report.report_date, report.html_path, report.article_count,
+             report.source_count, report.total_collected, report.generated_at)
+        )
+
+    def _fetch_index_reports(self, conn: sqlite3.Connection) -> IndexReports:
+        daily = [self._row_to_daily_report(r) for r in conn.execute(
+            "SELECT * FROM daily_reports ORDER BY report_date DESC"
+        ).fetchall()]
+        weekly = [self._row_to_weekly_report(r) for r in conn.execute(
+            "SELECT * FROM weekly_reports ORDER BY year DESC, week_number DESC"
+        ).fetchall()]
+        monthly = [self._row_to_monthly_report(r) for r in conn.execute(
+            "SELECT * FROM monthly_reports ORDER BY year DESC, month DESC"
+        ).fetchall()]
+        return daily, weekly, monthly
+
+    @staticmethod
+    def _row_to_daily_report(row: sqlite3.Row) -> DailyReport:
+        return DailyReport(
+            id=row["id"],
+            report_date=row["report_date"],
+            html_path=row["html_path"],
+            article_count=row["article_count"],
+            source_count=row["source_count"],
+            total_collected=row["total_collected"],
+            generated_at=row["generated_at"],
+        )
+
+    @staticmethod
+    def _row_to_weekly_report(row: sqlite3.Row) -> WeeklyReport:
+        return WeeklyReport(
+            id=row["id"],
+            week_start=row["week_start"],
+            week_end=row["week_end"],
+            year=row["year"],
+            week_number=row["week_number"],
+            html_path=row["html_path"],
+            article_count=row["article_count"],
+            generated_at=row["generated_at"],
+        )
+
+    @staticmethod
+    def _row_to_monthly_report(row: sqlite3.Row) -> MonthlyReport:
+        return MonthlyReport(
+            id=row["id"],
+            year=row["year"],
+            month=row["month"],
+            html_path=row["html_path"],
+            article_count=row["article_count"],
+            generated_at=row["generated_at"],
+        )
+
     @staticmethod
     def _row_to_curated_article(row: sqlite3.Row) -> CuratedArticle:
+        # 来源和分类取值很少、在分组时反复作为键，驻留后相同取值共享同一对象
         return CuratedArticle(
             id=row["id"],
             raw_article_id=row["raw_article_id"],
             title_zh=row["title_zh"],
             summary_zh=row["summary_zh"],
-            category=row["category"],
+            category=sys.intern(row["category"]),
             importance_score=row["importance_score"],
             is_selected_for_report=bool(row["is_selected_for_report"]),
-            source_name=row["source_name"],
+            source_name=sys.intern(row["source_name"] or ""),
             source_url=row["source_url"],
             published_date=row["published_date"],
             curated_at=row["curated_at"],
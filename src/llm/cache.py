@@ -0,0 +1,71 @@
+"""LLM结果磁盘缓存
+
+以输入内容的 BLAKE2 哈希为键，把结果存为 JSON 文件。
+同一批输入在有效期内重跑（如调试渲染问题）时直接复用，不再请求LLM。
+"""
+
+import hashlib
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from src.config.settings import LLM_CACHE_DIR, LLM_CACHE_TTL
+
+logger = logging.getLogger(__name__)
+
+
+def cache_key(payload: Any) -> str:
+    """输入内容的哈希键（JSON序列化后计算，与字典键顺序无关）"""
+    data = json.dumps(
+        payload, sort_keys=True, ensure_ascii=False,
+        separators=(",", ":"), check_circular=False,
+    )
+    return hashlib.blake2b(data.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _cache_path(namespace: str, key: str) -> Path:
+    return LLM_CACHE_DIR / namespace / f"{key}.json"
+
+
+def load(namespace: str, key: str) -> Optional[Any]:
+    """读取缓存，不存在、已过期或损坏时返回 None（过期文件顺带删除）"""
+    path = _cache_path(namespace, key)
+    try:
+        if time.time() - path.stat().st_mtime > LLM_CACHE_TTL:
+            path.unlink(missing_ok=True)
+            return None
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def save(namespace: str, key: str, value: Any) -> None:
+    """写入缓存，失败时只记录日志"""
+    path = _cache_path(namespace, key)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(value, ensure_ascii=False), encoding="utf-8")
+    except OSError as e:
+        logger.warning("LLM缓存写入失败 %s: %s", path, e)
+
+
+def cleanup_expired() -> int:
+    """删除所有过期的缓存文件，返回删除数量
+
+    缓存键随每日输入变化，多数文件不会再被读取，需定期清理。
+    """
+    if not LLM_CACHE_DIR.is_dir():
+        return 0
+    cutoff = time.time() - LLM_CACHE_TTL
+    removed = 0
+    for path in LLM_CACHE_DIR.glob("*/*.json"):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+                removed += 1
+        except OSError:
+            continue
+    logger.info("清理了 %d 个过期LLM缓存文件", removed)
+    return removed
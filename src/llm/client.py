@@ -10,12 +10,14 @@
 
 import json
 import logging
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 from src.config.settings import (
     OPENAI_API_KEY, OPENAI_BASE_URL, OPENAI_MODEL, OPENAI_MAX_TOKENS,
-    OPENAI_TEMPERATURE, MAX_RETRIES, RETRY_BACKOFF
+    OPENAI_TEMPERATURE, MAX_RETRIES, RETRY_BACKOFF, LLM_MAX_CONCURRENCY
 )
 
 logger = logging.getLogger(__name__)
@@ -38,6 +40,28 @@ AI_KEYWORDS = [
     "自动驾驶", "智能体", "具身智能",
 ]
 
+# 精编摘要每批文章数
+_SUMMARY_BATCH_SIZE = 10
+
+_BATCH_SUMMARY_PROMPT = (
+    "你是面向国家高层领导的AI动态简报编辑。请将以下新闻逐条精编。\n\n"
+    "【输出格式】\n"
+    "每条格式为：'序号: 【标题】摘要正文'\n"
+    "- 标题用【】括起，30-60字，必须包含核心结论和关键数据\n"
+    "- 摘要正文紧跟标题后，2-3行，约100-150字\n\n"
+    "【标题撰写规则——最重要】\n"
+    "标题必须让领导只看这一句就能抓住事件本质：\n"
+    "- 必须包含具体数据（金额、百分比、排名等，如有）\n"
+    "- 必须包含核心结论（是什么、做了什么、结果如何）\n"
+    "- 正确：'英伟达2026财年营收1305亿美元同比增114%，数据中心占比超80%'\n"
+    "- 正确：'Anthropic完成300亿美元融资，估值3800亿美元创AI纪录'\n"
+    "- 错误：'英伟达公布财务业绩'（无数据无结论）\n"
+    "- 错误：'Anthropic完成新一轮融资'（无金额无估值）\n\n"
+    "【文风铁律】\n"
+    "- 严谨、正式、平实，参照新华社通稿\n"
+    "- 禁止感叹号、标题党、网络用语、口语化"
+)
+
 
 class LLMClient:
     """LLM客户端"""
@@ -46,6 +70,8 @@ class LLMClient:
         self.api_key = OPENAI_API_KEY
         self.model = OPENAI_MODEL
         self.client = None
+        # 各线程池共享的在途请求名额，总并发不超过 LLM_MAX_CONCURRENCY
+        self._slots = threading.BoundedSemaphore(LLM_MAX_CONCURRENCY)
         self._init_client()
 
     def _init_client(self):
@@ -79,15 +105,16 @@ class LLMClient:
 
         for attempt in range(MAX_RETRIES):
             try:
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_prompt},
-                    ],
-                    temperature=temperature,
-                    max_tokens=max_tokens,
-                )
+                with self._slots:
+                    response = self.client.chat.completions.create(
+                        model=self.model,
+                        messages=[
+                            {"role": "system", "content": system_prompt},
+                            {"role": "user", "content": user_prompt},
+                        ],
+                        temperature=temperature,
+                        max_tokens=max_tokens,
+                    )
                 return response.choices[0].message.content or ""
             except Exception as e:
                 wait = RETRY_BACKOFF ** (attempt + 1)
@@ -297,51 +324,83 @@ class LLMClient:
         return result if result else (snippet[:150] if snippet else title)
 
     def generate_batch_summaries(self, articles: list[dict]) -> list[str]:
-        """批量生成中文精编摘要"""
+        """批量生成中文精编摘要
+
+        LLM不可用、请求失败或响应中缺少某条时，对应位置为空字符串，
+        由调用方降级处理。
+        """
+        results = [""] * len(articles)
         if not self.is_available:
-            return [a.get("snippet", a.get("title", ""))[:150] for a in articles]
+            return results
 
-        system_prompt = (
-            "你是面向国家高层领导的AI动态简报编辑。请将以下新闻逐条精编。\n\n"
-            "【输出格式】\n"
-            "每条格式为：'序号: 【标题】摘要正文'\n"
-            "- 标题用【】括起，30-60字，必须包含核心结论和关键数据\n"
-            "- 摘要正文紧跟标题后，2-3行，约100-150字\n\n"
-            "【标题撰写规则——最重要】\n"
-            "标题必须让领导只看这一句就能抓住事件本质：\n"
-            "- 必须包含具体数据（金额、百分比、排名等，如有）\n"
-            "- 必须包含核心结论（是什么、做了什么、结果如何）\n"
-            "- 正确：'英伟达2026财年营收1305亿美元同比增114%，数据中心占比超80%'\n"
-            "- 正确：'Anthropic完成300亿美元融资，估值3800亿美元创AI纪录'\n"
-            "- 错误：'英伟达公布财务业绩'（无数据无结论）\n"
-            "- 错误：'Anthropic完成新一轮融资'（无金额无估值）\n\n"
-            "【文风铁律】\n"
-            "- 严谨、正式、平实，参照新华社通稿\n"
-            "- 禁止感叹号、标题党、网络用语、口语化"
-        )
+        offsets = range(0, len(articles), _SUMMARY_BATCH_SIZE)
 
-        results = [""] * len(articles)
-        batch_size = 10
-        for i in range(0, len(articles), batch_size):
-            batch = articles[i:i + batch_size]
-            prompt_lines = []
-            for j, art in enumerate(batch):
-                idx = i + j + 1
-                prompt_lines.append(
-                    f"{idx}. [{art.get('source', '')}] {art['title']}\n"
-                    f"   内容：{art.get('snippet', '')[:300]}"
-                )
-            user_prompt = "请对以下新闻逐条生成精编中文摘要：\n\n" + "\n\n".join(prompt_lines)
-            response = self.chat(system_prompt, user_prompt, temperature=0.2)
+        def run_batch(i: int) -> None:
+            # 每批只解析本批序号，再写回 results 中属于本批的区间，可并发执行
+            batch = articles[i:i + _SUMMARY_BATCH_SIZE]
+            user_prompt = self._summary_user_prompt(batch, i)
+            response = self.chat(_BATCH_SUMMARY_PROMPT, user_prompt, temperature=0.2)
 
             if response:
-                self._parse_summary_response(response, results, i, batch)
-            else:
-                for j, art in enumerate(batch):
-                    results[i + j] = art.get("snippet", art.get("title", ""))[:150]
+                part = [""] * len(batch)
+                self._parse_summary_response(response, part, i)
+                results[i:i + len(batch)] = part
+
+        if len(offsets) > 1:
+            workers = min(LLM_MAX_CONCURRENCY, len(offsets))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                list(pool.map(run_batch, offsets))
+        else:
+            for i in offsets:
+                run_batch(i)
 
         return results
 
+    def generate_summaries_and_highlights(
+        self, articles: list[dict], highlight_count: int = 5
+    ) -> tuple[list[str], list[str]]:
+        """批量生成精编摘要，并在首批请求中一并提炼本期要点
+
+        Args:
+            articles: 按重要性降序排列的文章，要点取自前 highlight_count 条
+            highlight_count: 要点数量
+
+        Returns:
+            (摘要列表, 要点列表)；未能生成的摘要为空字符串，
+            未能提炼要点时要点列表为空
+        """
+        if not self.is_available or not articles:
+            return self.generate_batch_summaries(articles), []
+
+        first = articles[:_SUMMARY_BATCH_SIZE]
+        results = [""] * len(first)
+        user_prompt = (
+            self._summary_user_prompt(first, 0)
+            + f"\n\n全部摘要输出完毕后，另起一行输出'本期要点：'，"
+            f"再根据前{min(highlight_count, len(first))}条新闻提炼3-5条本期要点：\n"
+            "- 每条要点一句话，20-40字，以'▸'开头\n"
+            "- 语言严谨、正式、平实，禁止感叹号、网络用语、夸张修辞"
+        )
+        # 其余批次与首批并发请求
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            rest_future = pool.submit(
+                self.generate_batch_summaries, articles[_SUMMARY_BATCH_SIZE:]
+            )
+            response = self.chat(_BATCH_SUMMARY_PROMPT, user_prompt, temperature=0.2)
+            rest = rest_future.result()
+
+        highlights = []
+        if response:
+            body, _, tail = response.partition("本期要点")
+            self._parse_summary_response(body, results)
+            highlights = [
+                line.strip()
+                for line in tail.lstrip("：: \n").split("\n")
+                if line.strip() and len(line.strip()) > 5
+            ][:highlight_count]
+
+        return results + rest, highlights
+
     def generate_weekly_overview(self, daily_summaries: list[dict]) -> str:
         """生成每周总结概述"""
         if not self.is_available:
@@ -357,11 +416,17 @@ class LLMClient:
             "5. 禁止感叹号、夸张修辞、标题党词汇、网络用语"
         )
 
+        # 按日期归组，每天只写一次日期，组内保持传入顺序（重要性）
+        by_date: dict[str, list[str]] = {}
+        for d in daily_summaries[:50]:  # 限制输入量
+            by_date.setdefault(d.get("date") or "", []).append(
+                f"- {d.get('title', '')}: {d.get('summary', '')[:100]}"
+            )
         articles_text = "\n".join(
-            f"- [{d.get('date', '')}] {d.get('title', '')}: {d.get('summary', '')[:100]}"
-            for d in daily_summaries[:50]  # 限制输入量
+            f"[{date}]\n" + "\n".join(lines)
+            for date, lines in sorted(by_date.items())
         )
-        user_prompt = f"本周动态列表：\n{articles_text}"
+        user_prompt = f"本周动态列表（按日期）：\n{articles_text}"
         return self.chat(system_prompt, user_prompt, temperature=0.3)
 
     def generate_monthly_overview(self, weekly_summaries: list[str]) -> str:
@@ -401,7 +466,8 @@ class LLMClient:
             max_per_category: 每类最大条数
 
         Returns:
-            标注了 is_elite(bool) 的文章列表
+            标注了 is_elite(bool) 的文章列表；LLM请求失败、按分数降级的
+            批次另标注 elite_fallback=True
         """
         if not self.is_available:
             return self._fallback_elite(articles, max_per_category)
@@ -452,6 +518,7 @@ class LLMClient:
                 # LLM失败时，降级为按分数筛选
                 for art in batch:
                     art.setdefault("is_elite", art.get("importance_score", 0) >= 4)
+                    art["elite_fallback"] = True
 
         return articles
 
@@ -615,9 +682,24 @@ class LLMClient:
                 except (ValueError, IndexError):
                     continue
 
+    @staticmethod
+    def _summary_user_prompt(batch: list[dict], offset: int) -> str:
+        """构建一批文章的精编摘要请求（序号从 offset+1 起）"""
+        prompt_lines = []
+        for j, art in enumerate(batch):
+            idx = offset + j + 1
+            prompt_lines.append(
+                f"{idx}. [{art.get('source', '')}] {art['title']}\n"
+                f"   内容：{art.get('snippet', '')[:300]}"
+            )
+        return "请对以下新闻逐条生成精编中文摘要：\n\n" + "\n\n".join(prompt_lines)
+
     def _parse_summary_response(self, response: str, results: list[str],
-                                 offset: int, batch: list[dict]):
-        """解析摘要响应"""
+                                 offset: int = 0):
+        """解析摘要响应（响应中缺少的条目保持为空）
+
+        序号 offset+1 起对应 results[0]，超出本批范围的序号忽略。
+        """
         current_idx = None
         current_text = []
 
@@ -632,7 +714,7 @@ class LLMClient:
                 if sep in line:
                     prefix = line.split(sep, 1)[0].strip()
                     try:
-                        parsed_idx = int(prefix) - 1
+                        parsed_idx = int(prefix) - 1 - offset
                         line_content = line.split(sep, 1)[1].strip()
                         break
                     except ValueError:
@@ -650,9 +732,3 @@ class LLMClient:
         # 保存最后一条
         if current_idx is not None and 0 <= current_idx < len(results):
             results[current_idx] = "\n".join(current_text)
-
-        # 填充空值
-        for i in range(offset, min(offset + len(batch), len(results))):
-            if not results[i]:
-                art = batch[i - offset]
-                results[i] = art.get("snippet", art.get("title", ""))[:150]
@@ -17,6 +17,7 @@ from datetime import datetime, timezone, timedelta
 
 from src.config.settings import LOG_LEVEL, LOG_FORMAT
 from src.database.store import DatabaseStore
+from src.llm import cache as llm_cache
 from src.llm.client import LLMClient
 
 
@@ -96,6 +97,7 @@ async def run_daily(test_mode: bool = False):
 
     # 清理过期数据
     db.cleanup_old_raw_articles(days=90)
+    llm_cache.cleanup_expired()
 
     elapsed = time.time() - start_time
     logger.info("\n" + "=" * 60)
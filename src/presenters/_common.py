@@ -0,0 +1,62 @@
+"""各构建器共用的分组与格式化辅助"""
+
+from datetime import datetime
+from itertools import groupby, islice
+from operator import attrgetter
+from typing import Optional
+
+from src.database.models import CuratedArticle
+from src.config.settings import CATEGORY_ORDER
+
+_BY_CATEGORY = attrgetter("category")
+
+# 按重要性排序/选取的键
+BY_SCORE = attrgetter("importance_score")
+
+# 章节序号
+SECTION_NUMS = ("一", "二", "三", "四", "五", "六", "七", "八", "九", "十")
+
+# 中文星期映射
+WEEKDAY_NAMES = (
+    "星期一", "星期二", "星期三", "星期四", "星期五", "星期六", "星期日",
+)
+
+
+def _category_then_score(art: CuratedArticle) -> tuple[str, int]:
+    return art.category, -art.importance_score
+
+
+# 分类在 CATEGORY_ORDER 中的位置
+_CATEGORY_INDEX = {cat: i for i, cat in enumerate(CATEGORY_ORDER)}
+
+# 期号起算日（第001期）
+ISSUE_EPOCH = datetime(2026, 1, 1)
+
+
+def group_by_category(
+    articles: list[CuratedArticle], top_k: Optional[int] = None
+) -> dict[str, list[CuratedArticle]]:
+    """按分类分组，组内按重要性降序
+
+    整体排序一次后顺序切分，不再逐组排序。
+
+    Args:
+        articles: 待分组文章
+        top_k: 每组只保留前k条（不指定则保留全部）
+    """
+    ordered = sorted(articles, key=_category_then_score)
+    return {
+        cat: list(islice(group, top_k))
+        for cat, group in groupby(ordered, key=_BY_CATEGORY)
+    }
+
+
+def ordered_sections(
+    categorized: dict[str, list[CuratedArticle]]
+) -> list[tuple[str, list[CuratedArticle]]]:
+    """按 CATEGORY_ORDER 排列的 (分类, 文章列表)，顺序表之外的分类不输出"""
+    present = sorted(
+        categorized.keys() & _CATEGORY_INDEX.keys(),
+        key=_CATEGORY_INDEX.__getitem__,
+    )
+    return [(cat, categorized[cat]) for cat in present]
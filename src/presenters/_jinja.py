@@ -0,0 +1,32 @@
+"""呈现层共享的Jinja2环境
+
+模板编译结果可在各构建器、各次构建之间安全复用，
+因此整个进程只创建一个 Environment。
+"""
+
+from functools import lru_cache
+from typing import Optional
+
+from jinja2 import (
+    Environment, FileSystemLoader, StrictUndefined, Template, TemplateNotFound,
+)
+
+from src.config.settings import TEMPLATES_DIR
+
+_ENV = Environment(
+    loader=FileSystemLoader(str(TEMPLATES_DIR)),
+    autoescape=True,
+    # 模板变量缺失时直接报错，避免静默输出空白
+    undefined=StrictUndefined,
+    auto_reload=False,
+    cache_size=400,
+)
+
+
+@lru_cache(maxsize=None)
+def load_template(name: str) -> Optional[Template]:
+    """加载 templates/ 下的模板，不存在时返回 None（调用方改用内置模板）"""
+    try:
+        return _ENV.get_template(name)
+    except TemplateNotFound:
+        return None
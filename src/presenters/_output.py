@@ -0,0 +1,14 @@
+"""报告输出辅助"""
+
+from pathlib import Path
+
+# 本进程内已确认存在的输出目录
+_ensured_dirs: set[Path] = set()
+
+
+def ensure_dir(path: Path) -> Path:
+    """确保目录存在，同一目录在进程内只执行一次 mkdir"""
+    if path not in _ensured_dirs:
+        path.mkdir(parents=True, exist_ok=True)
+        _ensured_dirs.add(path)
+    return path
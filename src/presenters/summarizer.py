@@ -7,12 +7,29 @@
 - 政府公文风格
 """
 
+import heapq
 import logging
+
 from src.database.models import CuratedArticle
+from src.llm import cache as llm_cache
 from src.llm.client import LLMClient
+from src.presenters._common import BY_SCORE
 
 logger = logging.getLogger(__name__)
 
+_HIGHLIGHTS_PROMPT = (
+    "你是面向国家高层领导的AI动态简报编辑。请根据以下重要新闻，"
+    "提炼出3-5条'本期要点'。\n"
+    "要求：\n"
+    "1. 每条要点一句话，20-40字\n"
+    "2. 语言严谨、正式、平实，参照新华社通稿风格\n"
+    "3. 每条以'▸'开头\n"
+    "4. 直接输出要点，不加其他说明\n"
+    "5. 禁止使用感叹号、网络用语、夸张修辞、标题党词汇\n"
+    "6. 正确示范：'▸ 谷歌发布Gemini 3.1 Pro模型，推理能力显著提升'\n"
+    "7. 错误示范：'▸ 谷歌重磅发布最强模型！性能炸裂'"
+)
+
 
 class Summarizer:
     """精编摘要生成器"""
@@ -35,24 +52,121 @@ class Summarizer:
             return []
 
         logger.info("开始为 %d 篇文章生成精编摘要...", len(articles))
+        self._refine(articles)
+        return articles
+
+    def generate_summaries_and_highlights(
+        self, articles: list[CuratedArticle], count: int = 5
+    ) -> tuple[list[CuratedArticle], list[str]]:
+        """生成精编摘要和本期要点，首批摘要请求中一并提炼要点
+
+        要点取自重要性最高的 count 篇文章。合并请求的要点按这些文章的
+        原始输入缓存，重跑时直接复用；无缓存且这些文章命中摘要缓存
+        （无需再请求摘要）或合并请求未返回要点时，单独调用 generate_highlights。
+
+        Returns:
+            (带有精编摘要的文章列表, 要点列表)
+        """
+        if not articles:
+            return [], []
+
+        logger.info("开始为 %d 篇文章生成精编摘要...", len(articles))
+        top_articles = heapq.nlargest(count, articles, key=BY_SCORE)
+        # 要点缓存键须在精编改写标题/摘要之前计算
+        highlights_key = llm_cache.cache_key([self._to_dicts(top_articles), count])
+        cached = (
+            llm_cache.load("highlights", highlights_key)
+            if self.llm.is_available else None
+        )
+
+        # 按重要性排序后送入，首批即包含要点所需的文章
+        ordered = sorted(articles, key=BY_SCORE, reverse=True)
+        highlights = self._refine(ordered, None if cached else top_articles)
+
+        if highlights:
+            llm_cache.save("highlights", highlights_key, highlights)
+        elif cached:
+            highlights = cached
+        else:
+            highlights = self.generate_highlights(articles, count)
+        return articles, highlights
+
+    def _refine(
+        self,
+        articles: list[CuratedArticle],
+        top_articles: list[CuratedArticle] | None = None,
+    ) -> list[str]:
+        """为文章生成精编摘要并写回
+
+        先查磁盘缓存（按输入的标题、片段、来源），只为未命中的文章调用LLM。
+        传入 top_articles 且它们都需调用LLM时，在首批请求中一并提炼要点。
 
-        # 准备批量输入
-        article_dicts = []
-        for art in articles:
-            article_dicts.append({
+        Returns:
+            合并请求提炼出的要点（未合并请求时为空）
+        """
+        dicts = self._to_dicts(articles)
+        keys = [llm_cache.cache_key(d) for d in dicts]
+
+        misses: list[int] = []
+        for i, (art, key) in enumerate(zip(articles, keys)):
+            cached = (
+                llm_cache.load("summaries", key) if self.llm.is_available else None
+            )
+            if cached:
+                art.title_zh, art.summary_zh = cached
+            else:
+                misses.append(i)
+        if len(misses) < len(articles):
+            logger.info("精编摘要缓存命中 %d 篇", len(articles) - len(misses))
+        if not misses:
+            return []
+
+        pending = [articles[i] for i in misses]
+        pending_dicts = [dicts[i] for i in misses]
+        highlights: list[str] = []
+        pending_ids = {id(art) for art in pending}
+        if top_articles and all(id(art) in pending_ids for art in top_articles):
+            summaries, highlights = self.llm.generate_summaries_and_highlights(
+                pending_dicts, highlight_count=len(top_articles)
+            )
+        else:
+            summaries = self.llm.generate_batch_summaries(pending_dicts)
+        refined = self._apply_summaries(pending, summaries)
+
+        # 只缓存LLM实际精编的条目，降级结果下次仍会重试
+        for j in refined:
+            art = pending[j]
+            llm_cache.save("summaries", keys[misses[j]], [art.title_zh, art.summary_zh])
+        logger.info("精编摘要生成完成")
+        return highlights
+
+    @staticmethod
+    def _to_dicts(articles: list[CuratedArticle]) -> list[dict]:
+        """准备批量输入"""
+        return [
+            {
                 "title": art.title_zh,
                 "snippet": art.summary_zh,
                 "source": art.source_name,
-            })
+            }
+            for art in articles
+        ]
 
-        # 批量生成摘要
-        summaries = self.llm.generate_batch_summaries(article_dicts)
+    def _apply_summaries(
+        self, articles: list[CuratedArticle], summaries: list[str]
+    ) -> list[int]:
+        """用LLM输出更新文章标题和摘要
 
-        # 更新文章标题和摘要
-        for i, art in enumerate(articles):
-            if i < len(summaries) and summaries[i]:
-                text = summaries[i].strip()
+        LLM未返回某条（空字符串）时降级为原文片段。
 
+        Returns:
+            由LLM实际精编的文章下标
+        """
+        refined = []
+        for i, art in enumerate(articles):
+            llm_text = summaries[i] if i < len(summaries) else ""
+            text = (llm_text or art.summary_zh[:150]).strip()
+            if text:
                 # 尝试从LLM输出中分离标题和摘要
                 title, body = self._split_title_and_body(text)
 
@@ -66,8 +180,9 @@ class Summarizer:
                     )
                     art.summary_zh = text
 
-        logger.info("精编摘要生成完成")
-        return articles
+                if llm_text:
+                    refined.append(i)
+        return refined
 
     def generate_highlights(
         self, articles: list[CuratedArticle], count: int = 5
@@ -84,40 +199,32 @@ class Summarizer:
         if not articles:
             return []
 
-        top_articles = sorted(
-            articles, key=lambda a: a.importance_score, reverse=True
-        )[:count]
+        top_articles = heapq.nlargest(count, articles, key=BY_SCORE)
 
         if not self.llm.is_available:
             # 降级：直接使用标题
             return [art.title_zh for art in top_articles]
 
-        system_prompt = (
-            "你是面向国家高层领导的AI动态简报编辑。请根据以下重要新闻，"
-            "提炼出3-5条'本期要点'。\n"
-            "要求：\n"
-            "1. 每条要点一句话，20-40字\n"
-            "2. 语言严谨、正式、平实，参照新华社通稿风格\n"
-            "3. 每条以'▸'开头\n"
-            "4. 直接输出要点，不加其他说明\n"
-            "5. 禁止使用感叹号、网络用语、夸张修辞、标题党词汇\n"
-            "6. 正确示范：'▸ 谷歌发布Gemini 3.1 Pro模型，推理能力显著提升'\n"
-            "7. 错误示范：'▸ 谷歌重磅发布最强模型！性能炸裂'"
-        )
-
+        # 只有LLM可用时才拼接输入文本（降级路径已在上方返回）
         articles_text = "\n".join(
-            f"{i+1}. [{art.source_name}] {art.title_zh}: {art.summary_zh[:100]}"
-            for i, art in enumerate(top_articles)
+            f"{i}. [{art.source_name}] {art.title_zh}: {art.summary_zh[:100]}"
+            for i, art in enumerate(top_articles, 1)
         )
 
-        response = self.llm.chat(system_prompt, articles_text, temperature=0.2)
+        key = llm_cache.cache_key([_HIGHLIGHTS_PROMPT, articles_text, count])
+        cached = llm_cache.load("highlights", key)
+        if cached:
+            return cached
+
+        response = self.llm.chat(_HIGHLIGHTS_PROMPT, articles_text, temperature=0.2)
         if response:
             highlights = [
-                line.strip()
-                for line in response.strip().split("\n")
-                if line.strip() and len(line.strip()) > 5
-            ]
-            return highlights[:count]
+                line
+                for line in map(str.strip, response.split("\n"))
+                if len(line) > 5
+            ][:count]
+            llm_cache.save("highlights", key, highlights)
+            return highlights
 
         return [art.title_zh for art in top_articles]
 
@@ -132,30 +239,28 @@ class Summarizer:
         text = text.strip()
 
         # 格式1: 【标题】摘要
-        if "【" in text and "】" in text:
-            start = text.index("【") + 1
-            end = text.index("】")
-            title = text[start:end].strip()
-            body = text[end + 1:].strip()
+        start = text.find("【")
+        end = text.find("】")
+        if start != -1 and end != -1:
+            title = text[start + 1:end].strip()
             if title and len(title) >= 10:
-                return title, body
+                return title, text[end + 1:].strip()
 
         # 格式2: 第一行为标题（如果第一行30-80字且不含句号结尾）
-        lines = text.split("\n", 1)
-        if len(lines) >= 2:
-            first_line = lines[0].strip()
-            rest = lines[1].strip()
+        first_line, newline, rest = text.partition("\n")
+        if newline:
+            first_line = first_line.strip()
             if 10 <= len(first_line) <= 100 and not first_line.endswith("。"):
-                return first_line, rest
+                return first_line, rest.strip()
 
-        # 格式3: 用第一个句号分割
-        for sep in ["。", "；"]:
-            if sep in text:
-                parts = text.split(sep, 1)
-                title_candidate = parts[0].strip()
-                if 10 <= len(title_candidate) <= 100:
-                    return title_candidate, text
-                break
+        # 格式3: 用第一个句号分割（优先句号，其次分号）
+        idx = text.find("。")
+        if idx == -1:
+            idx = text.find("；")
+        if idx != -1:
+            title_candidate = text[:idx].strip()
+            if 10 <= len(title_candidate) <= 100:
+                return title_candidate, text
 
         return "", text
 
@@ -164,16 +269,18 @@ class Summarizer:
         """判断文本是否主要是英文"""
         if not text:
             return False
-        ascii_count = sum(1 for c in text if ord(c) < 128)
+        # encode 丢弃非ASCII字符，计数在C层完成
+        ascii_count = len(text.encode("ascii", "ignore"))
         return ascii_count / len(text) > 0.7
 
     @staticmethod
     def _extract_title_from_summary(summary: str, original_title: str) -> str:
         """从摘要中提取中文标题"""
         # 取摘要的第一句作为标题
-        for sep in ["。", "，", "；", "\n"]:
-            if sep in summary:
-                first_sentence = summary.split(sep)[0].strip()
+        for sep in ("。", "，", "；", "\n"):
+            idx = summary.find(sep)
+            if idx != -1:
+                first_sentence = summary[:idx].strip()
                 if 10 <= len(first_sentence) <= 50:
                     return first_sentence
         # 如果提取失败，截取前30字
@@ -5,19 +5,109 @@
 """
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 from collections import defaultdict
+from dataclasses import replace
 
+from jinja2.environment import TemplateStream
+
+from src.curators.deduplicator import Deduplicator
 from src.database.models import CuratedArticle, WeeklyReport
 from src.database.store import DatabaseStore
 from src.llm.client import LLMClient
+from src.presenters._common import BY_SCORE, SECTION_NUMS, ordered_sections
+from src.presenters._jinja import _ENV
+from src.presenters._output import ensure_dir
 from src.config.settings import (
-    DOCS_DIR, CATEGORY_ORDER, REPORT_TITLE
+    DOCS_DIR, REPORT_TITLE, OVERVIEW_TITLE_SIMILARITY_THRESHOLD
 )
 
 logger = logging.getLogger(__name__)
 
+# 周报样式表
+_WEEKLY_CSS = """
+        * { margin: 0; padding: 0; box-sizing: border-box; }
+        body {
+            font-family: "SimSun", "宋体", "Microsoft YaHei", serif;
+            background: #f5f5f5; color: #333; line-height: 1.8;
+        }
+        .container {
+            max-width: 800px; margin: 20px auto; background: #fff;
+            padding: 40px 50px; box-shadow: 0 1px 3px rgba(0,0,0,0.1);
+        }
+        .header-line { border-top: 3px solid #003366; margin-bottom: 30px; }
+        .report-title {
+            text-align: center; color: #003366; font-size: 26px;
+            font-weight: bold; letter-spacing: 3px; margin-bottom: 5px;
+        }
+        .report-subtitle {
+            text-align: center; color: #666; font-size: 13px;
+            margin-bottom: 15px;
+        }
+        .report-meta {
+            text-align: center; color: #555; font-size: 14px;
+            margin-bottom: 20px; padding-bottom: 15px;
+            border-bottom: 1px solid #ddd;
+        }
+        .overview-section {
+            background: #f0f4f8; border-left: 4px solid #003366;
+            padding: 15px 20px; margin: 20px 0;
+        }
+        .overview-title {
+            color: #003366; font-size: 16px; font-weight: bold;
+            margin-bottom: 10px;
+        }
+        .overview-text { font-size: 14px; line-height: 1.8; }
+        .section-divider {
+            border-top: 2px solid #003366; margin: 25px 0 20px;
+        }
+        .category-title {
+            color: #003366; font-size: 18px; font-weight: bold;
+            margin-bottom: 5px;
+        }
+        .category-divider {
+            border-top: 1px solid #ccc; margin-bottom: 15px;
+        }
+        .article-item {
+            margin-bottom: 15px; padding-bottom: 12px;
+            border-bottom: 1px dotted #e0e0e0;
+        }
+        .article-item:last-child { border-bottom: none; }
+        .importance { color: #DAA520; font-size: 13px; margin-right: 5px; }
+        .article-title {
+            font-weight: bold; color: #003366; font-size: 15px;
+        }
+        .article-summary {
+            font-size: 14px; color: #444; line-height: 1.7;
+            margin: 5px 0; text-indent: 2em;
+        }
+        .article-meta { font-size: 12px; color: #999; }
+        .footer-section {
+            border-top: 2px solid #003366; margin-top: 30px;
+            padding-top: 15px;
+        }
+        .footer-text { font-size: 13px; color: #666; }
+        @media (max-width: 600px) {
+            .container { padding: 20px 15px; margin: 10px; }
+        }
+    """
+
+# 周度综述最多送入LLM的动态条数（与 generate_weekly_overview 的截断一致）
+_OVERVIEW_INPUT_LIMIT = 50
+
+
+def _title_shingles(title: str) -> frozenset[str]:
+    """标题的相邻字符二元组（中文标题无空格，按字符切分，忽略标点）"""
+    text = "".join(c for c in title.lower() if c.isalnum())
+    return frozenset(text[i:i + 2] for i in range(len(text) - 1))
+
+
+# 同来源同分类保留的条数，及合并动态中列出的其余标题数
+_KEEP_PER_GROUP = 2
+_COMBINED_TITLES = 5
+
 
 class WeeklyReportBuilder:
     """每周汇总构建器"""
@@ -59,27 +149,27 @@ class WeeklyReportBuilder:
             logger.warning("本周无入选文章，跳过周报生成")
             return ""
 
-        # 生成周度综述
-        overview = self._generate_overview(articles)
+        # 周度综述（LLM请求）在后台线程生成，同时在本线程合并分组
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            overview_future = pool.submit(self._generate_overview, articles)
 
-        # 合并同类信息
-        merged = self._merge_similar(articles)
+            # 合并同类信息并按分类分组
+            categorized = self._merge_and_group(articles)
 
-        # 按分类分组
-        categorized = self._group_by_category(merged)
+            overview = overview_future.result()
 
         # 生成HTML
         output_dir = DOCS_DIR / "weekly"
-        output_dir.mkdir(parents=True, exist_ok=True)
+        ensure_dir(output_dir)
         output_path = output_dir / f"{year}-W{week_num:02d}.html"
 
-        html = self._render(
+        stream = self._render(
             year, week_num,
             week_start.strftime("%Y年%m月%d日"),
             week_end.strftime("%Y年%m月%d日"),
             overview, categorized, len(articles),
         )
-        output_path.write_text(html, encoding="utf-8")
+        stream.dump(str(output_path), encoding="utf-8")
 
         # 记录到数据库
         report = WeeklyReport(
@@ -96,66 +186,74 @@ class WeeklyReportBuilder:
         return str(output_path)
 
     def _generate_overview(self, articles: list[CuratedArticle]) -> str:
-        """生成周度综述"""
+        """生成周度综述
+
+        不同日期、不同来源对同一事件的重复报道只保留一条送入LLM，
+        把有限的输入名额（前50条）留给不同的动态。
+        """
         daily_summaries = []
+        seen: list[frozenset[str]] = []
         for art in articles:
+            shingles = _title_shingles(art.title_zh)
+            if any(
+                Deduplicator._jaccard_similarity(shingles, other)
+                >= OVERVIEW_TITLE_SIMILARITY_THRESHOLD
+                for other in seen
+            ):
+                continue
+            seen.append(shingles)
             daily_summaries.append({
                 "date": art.report_date,
                 "title": art.title_zh,
                 "summary": art.summary_zh,
             })
+            if len(daily_summaries) >= _OVERVIEW_INPUT_LIMIT:
+                break
         return self.llm.generate_weekly_overview(daily_summaries)
 
-    def _merge_similar(
+    def _merge_and_group(
         self, articles: list[CuratedArticle]
-    ) -> list[CuratedArticle]:
-        """合并同公司/同主题的相似动态"""
-        # 按来源+分类分组
-        groups: dict[str, list[CuratedArticle]] = defaultdict(list)
+    ) -> dict[str, list[CuratedArticle]]:
+        """合并同公司/同主题的相似动态，直接按分类分组（组内按重要性降序）
+
+        articles 需已按重要性降序（get_curated_articles_by_date_range 的顺序）。
+        """
+        # 按来源+分类分组（元组键，免去逐条拼接字符串）
+        groups: dict[tuple[str, str], list[CuratedArticle]] = defaultdict(list)
         for art in articles:
-            key = f"{art.source_name}|{art.category}"
-            groups[key].append(art)
+            groups[art.source_name, art.category].append(art)
 
-        merged = []
-        for key, group in groups.items():
+        categorized: dict[str, list[CuratedArticle]] = defaultdict(list)
+        for (_, category), group in groups.items():
+            bucket = categorized[category]
             if len(group) <= 2:
-                merged.extend(group)
+                bucket.extend(group)
             else:
-                # 保留最重要的2条，其余合并
-                sorted_group = sorted(
-                    group, key=lambda a: a.importance_score, reverse=True
+                # 保留最重要的2条，其余合并；查询结果已按重要性降序，
+                # 组内顺序即重要性顺序，直接切片
+                top = group[:_KEEP_PER_GROUP + _COMBINED_TITLES]
+                bucket.extend(top[:_KEEP_PER_GROUP])
+                # 多余的合并为一条综合动态
+                first = group[0]
+                remaining_count = len(group) - _KEEP_PER_GROUP
+                titles = [a.title_zh[:30] for a in top[_KEEP_PER_GROUP:]]
+                # 来源、分类、链接、日期沿用该组首条，其余字段重置
+                combined = replace(
+                    first,
+                    id=None,
+                    raw_article_id=0,
+                    title_zh=f"{first.source_name}本周其他{remaining_count}条动态",
+                    summary_zh="、".join(titles) + "等。",
+                    importance_score=2,
+                    is_selected_for_report=True,
+                    published_date=first.report_date,
+                    curated_at="",
                 )
-                merged.extend(sorted_group[:2])
-                # 如果有多余的，合并为一条综合动态
-                if len(sorted_group) > 2:
-                    remaining = sorted_group[2:]
-                    combined = CuratedArticle(
-                        raw_article_id=0,
-                        title_zh=f"{group[0].source_name}本周其他{len(remaining)}条动态",
-                        summary_zh="、".join(
-                            a.title_zh[:30] for a in remaining[:5]
-                        ) + "等。",
-                        category=group[0].category,
-                        importance_score=2,
-                        is_selected_for_report=True,
-                        source_name=group[0].source_name,
-                        source_url=group[0].source_url,
-                        published_date=group[0].report_date,
-                        report_date=group[0].report_date,
-                    )
-                    merged.append(combined)
-
-        return merged
-
-    def _group_by_category(
-        self, articles: list[CuratedArticle]
-    ) -> dict[str, list[CuratedArticle]]:
-        groups: dict[str, list[CuratedArticle]] = defaultdict(list)
-        for art in articles:
-            groups[art.category].append(art)
-        for cat in groups:
-            groups[cat].sort(key=lambda a: a.importance_score, reverse=True)
-        return dict(groups)
+                bucket.append(combined)
+
+        for bucket in categorized.values():
+            bucket.sort(key=BY_SCORE, reverse=True)
+        return dict(categorized)
 
     def _render(
         self,
@@ -166,128 +264,65 @@ class WeeklyReportBuilder:
         overview: str,
         categorized: dict[str, list[CuratedArticle]],
         total_articles: int,
-    ) -> str:
-        categories_html = ""
-        section_num = 0
-        nums = ["一", "二", "三", "四", "五", "六", "七", "八", "九", "十"]
-        for cat in CATEGORY_ORDER:
-            if cat not in categorized:
-                continue
-            section_num += 1
-            num_str = nums[section_num - 1] if section_num <= 10 else str(section_num)
-
-            articles_html = ""
-            for art in categorized[cat]:
-                stars = "★" * art.importance_score
-                articles_html += f"""
-                <div class="article-item">
-                    <div class="article-header">
-                        <span class="importance">{stars}</span>
-                        <span class="article-title">{art.title_zh}</span>
-                    </div>
-                    <p class="article-summary">{art.summary_zh}</p>
-                    <div class="article-meta">来源：{art.source_name}</div>
-                </div>"""
+    ) -> TemplateStream:
+        return _WEEKLY_TMPL.stream(
+            title=REPORT_TITLE,
+            year=year,
+            week_num=week_num,
+            start_display=start_display,
+            end_display=end_display,
+            overview=overview,
+            sections=ordered_sections(categorized),
+            nums=SECTION_NUMS,
+            total_articles=total_articles,
+        )
 
-            categories_html += f"""
-            <div class="category-section">
-                <h2 class="category-title">{num_str}、{cat}</h2>
-                <div class="category-divider"></div>
-                {articles_html}
-            </div>"""
 
-        return f"""<!DOCTYPE html>
+# 周报页面模板
+_WEEKLY_TMPL_SRC = """<!DOCTYPE html>
 <html lang="zh-CN">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{REPORT_TITLE} - 周报 {year}年第{week_num}周</title>
-    <style>
-        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-        body {{
-            font-family: "SimSun", "宋体", "Microsoft YaHei", serif;
-            background: #f5f5f5; color: #333; line-height: 1.8;
-        }}
-        .container {{
-            max-width: 800px; margin: 20px auto; background: #fff;
-            padding: 40px 50px; box-shadow: 0 1px 3px rgba(0,0,0,0.1);
-        }}
-        .header-line {{ border-top: 3px solid #003366; margin-bottom: 30px; }}
-        .report-title {{
-            text-align: center; color: #003366; font-size: 26px;
-            font-weight: bold; letter-spacing: 3px; margin-bottom: 5px;
-        }}
-        .report-subtitle {{
-            text-align: center; color: #666; font-size: 13px;
-            margin-bottom: 15px;
-        }}
-        .report-meta {{
-            text-align: center; color: #555; font-size: 14px;
-            margin-bottom: 20px; padding-bottom: 15px;
-            border-bottom: 1px solid #ddd;
-        }}
-        .overview-section {{
-            background: #f0f4f8; border-left: 4px solid #003366;
-            padding: 15px 20px; margin: 20px 0;
-        }}
-        .overview-title {{
-            color: #003366; font-size: 16px; font-weight: bold;
-            margin-bottom: 10px;
-        }}
-        .overview-text {{ font-size: 14px; line-height: 1.8; }}
-        .section-divider {{
-            border-top: 2px solid #003366; margin: 25px 0 20px;
-        }}
-        .category-title {{
-            color: #003366; font-size: 18px; font-weight: bold;
-            margin-bottom: 5px;
-        }}
-        .category-divider {{
-            border-top: 1px solid #ccc; margin-bottom: 15px;
-        }}
-        .article-item {{
-            margin-bottom: 15px; padding-bottom: 12px;
-            border-bottom: 1px dotted #e0e0e0;
-        }}
-        .article-item:last-child {{ border-bottom: none; }}
-        .importance {{ color: #DAA520; font-size: 13px; margin-right: 5px; }}
-        .article-title {{
-            font-weight: bold; color: #003366; font-size: 15px;
-        }}
-        .article-summary {{
-            font-size: 14px; color: #444; line-height: 1.7;
-            margin: 5px 0; text-indent: 2em;
-        }}
-        .article-meta {{ font-size: 12px; color: #999; }}
-        .footer-section {{
-            border-top: 2px solid #003366; margin-top: 30px;
-            padding-top: 15px;
-        }}
-        .footer-text {{ font-size: 13px; color: #666; }}
-        @media (max-width: 600px) {{
-            .container {{ padding: 20px 15px; margin: 10px; }}
-        }}
-    </style>
+    <title>{{ title }} - 周报 {{ year }}年第{{ week_num }}周</title>
+    <style>""" + _WEEKLY_CSS + """</style>
 </head>
 <body>
     <div class="container">
         <div class="header-line"></div>
-        <h1 class="report-title">{REPORT_TITLE} · 周报</h1>
+        <h1 class="report-title">{{ title }} · 周报</h1>
         <p class="report-subtitle">AI WEEKLY INTELLIGENCE BRIEF</p>
         <div class="report-meta">
-            {year}年第{week_num}周 &nbsp;|&nbsp; {start_display} — {end_display}
+            {{ year }}年第{{ week_num }}周 &nbsp;|&nbsp; {{ start_display }} — {{ end_display }}
         </div>
         <div class="overview-section">
             <div class="overview-title">【本周综述】</div>
-            <p class="overview-text">{overview}</p>
+            <p class="overview-text">{{ overview }}</p>
         </div>
         <div class="section-divider"></div>
-        {categories_html}
+        {%- for cat, cat_articles in sections %}
+            <div class="category-section">
+                <h2 class="category-title">{{ nums[loop.index0] if loop.index <= 10 else loop.index }}、{{ cat }}</h2>
+                <div class="category-divider"></div>
+                {%- for art in cat_articles %}
+                <div class="article-item">
+                    <div class="article-header">
+                        <span class="importance">{{ art.importance_stars }}</span>
+                        <span class="article-title">{{ art.title_zh }}</span>
+                    </div>
+                    <p class="article-summary">{{ art.summary_zh }}</p>
+                    <div class="article-meta">来源：{{ art.source_name }}</div>
+                </div>
+                {%- endfor %}
+            </div>
+        {%- endfor %}
         <div class="footer-section">
             <p class="footer-text">
-                本周共汇集{total_articles}条动态。
+                本周共汇集{{ total_articles }}条动态。
             </p>
         </div>
     </div>
 </body>
 </html>"""
+
+_WEEKLY_TMPL = _ENV.from_string(_WEEKLY_TMPL_SRC)